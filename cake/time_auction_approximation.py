@@ -17,16 +17,18 @@ import random
 from agents import *
 from allocations import *
 from typing import *
-from networkx import *
 from math import *
+from scipy.optimize import linear_sum_assignment
+
+import numpy as np
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-def stringify_agent_piece_graph(g: Graph):
-    """ Convert an agent-piece graph into a string, for display and testing """
-    return str([(agent.name(), piece, data) for (agent,piece,data) in g.edges(data=True)])
+# Pieces that are not among the heaviest of any agent are dropped before matching,
+# when there are at least this many times more pieces than agents.
+PRUNING_RATIO = 100
 
 def stringify_edge_set(s: set):
     """ Convert an agent-piece graph into a string, for display and testing """
@@ -58,7 +60,6 @@ def equally_sized_pieces(agents: List[Agent], piece_size: float) -> Allocation:
     >>> Alice = PiecewiseConstantAgent([1, 1, 1, 1, 1], "Alice")
     >>> Bob = PiecewiseConstantAgent([3, 3, 3, 1, 1], "Bob")
     >>> equally_sized_pieces([Alice, Bob], 3 / 5)
-    > Alice gets [(2, 5)] with value 3.0
     > Bob gets [(0, 3)] with value 9.0
     <BLANKLINE>
     """
@@ -87,36 +88,32 @@ def equally_sized_pieces(agents: List[Agent], piece_size: float) -> Allocation:
 
     length = max([a.cake_length() for a in agents])
     # Normalizing the partitions to match the form of the pieces allocation of the Agents
-    normalize_partitions = [(int(p[0] * length), int(p[1] * length)) for p in all_partitions]
-    normalize_partitions_0_l = [(int(p[0] * length), int(p[1] * length)) for p in partition_0_l]
-    normalize_partitions_delta_l = [(int(p[0] * length), int(p[1] * length)) for p in partition_delta_l]
+    normalize_partitions = list(map(tuple, (np.array(all_partitions) * length).astype(np.int64).tolist()))
+    normalize_partitions_0_l = normalize_partitions[:len(partition_0_l)]
+    normalize_partitions_delta_l = normalize_partitions[len(partition_0_l):]
 
     # Evaluating the pieces of the partition for every agent there is
     logger.info("For each piece (in both partitions) and agent: compute the agent's value of the piece.")
-    evaluations = {}
-    # Get evaluation for every piece
-    for piece in normalize_partitions:
-        # For every piece get evaluation for every agent
-        for agent in agents:
-            evaluations[(agent, piece)] = agent.eval(start=piece[0], end=piece[1])
-    # Create the matching graph
-    # One side is the agents, the other side is the partitions and the weights are the evaluations
-    logger.info("Create the partition graphs G_0_l and G_d_l")
-    g_0_l = create_matching_graph(agents, normalize_partitions_0_l, evaluations)
-    logger.info("  The graph G_0_l = %s", stringify_agent_piece_graph(g_0_l))
-    g_delta_l = create_matching_graph(agents, normalize_partitions_delta_l, evaluations)
-    logger.info("  The graph G_d_l = %s", stringify_agent_piece_graph(g_delta_l))
-
-    # Set the edges to be in order, (Agent, partition)
+    evaluations = evaluate_matrix(agents, normalize_partitions)
+    # Create the weight matrices of the two bipartite graphs
+    # The rows are the agents, the columns are the pieces and the weights are the evaluations
+    logger.info("Create the weight matrices of the partition graphs G_0_l and G_d_l")
+    weights_0_l = evaluations[:, :len(normalize_partitions_0_l)]
+    logger.info("  The weights of G_0_l = %s", weights_0_l.tolist())
+    weights_delta_l = evaluations[:, len(normalize_partitions_0_l):]
+    logger.info("  The weights of G_d_l = %s", weights_delta_l.tolist())
+
     logger.info("Compute maximum weight matchings for each graph respectively")
-    edges_set_0_l = fix_edges(max_weight_matching(g_0_l))
+    rows_0_l, cols_0_l = max_weight_assignment(weights_0_l)
+    edges_set_0_l = {(agents[i], normalize_partitions_0_l[j]) for i, j in zip(rows_0_l, cols_0_l)}
     logger.info("  The edges in G_0_l = %s", stringify_edge_set(edges_set_0_l))
-    edges_set_delta_l = fix_edges(max_weight_matching(g_delta_l))
+    rows_delta_l, cols_delta_l = max_weight_assignment(weights_delta_l)
+    edges_set_delta_l = {(agents[i], normalize_partitions_delta_l[j]) for i, j in zip(rows_delta_l, cols_delta_l)}
     logger.info("  The edges in G_d_l = %s", stringify_edge_set(edges_set_delta_l))
 
     logger.info("Choose the heavier among the matchings")
     # Check which matching is heavier and choose it
-    if calculate_weight(g_delta_l, edges_set_delta_l) > calculate_weight(g_0_l, edges_set_0_l):
+    if calculate_weight(weights_delta_l, rows_delta_l, cols_delta_l) > calculate_weight(weights_0_l, rows_0_l, cols_0_l):
         edges_set = edges_set_delta_l
     else:
         edges_set = edges_set_0_l
@@ -127,8 +124,9 @@ def equally_sized_pieces(agents: List[Agent], piece_size: float) -> Allocation:
     # Create allocation
     allocation = Allocation(chosen_agents)
     # Add the edges to the allocation
+    agent_index = {agent: i for i, agent in enumerate(chosen_agents)}
     for edge in edges_set:
-        allocation.set_piece(agent_index=chosen_agents.index(edge[0]), piece=[edge[1]])
+        allocation.set_piece(agent_index=agent_index[edge[0]], piece=[edge[1]])
 
     return allocation
 
@@ -144,7 +142,9 @@ def discrete_setting(agents: List[Agent], pieces: List[Tuple[float, float]]) ->
     - Approximates the optimal welfare by a factor of log m + 1.
 
     :param agents: A list of Agent objects.
-    :param pieces: List of sized pieces.
+    :param pieces: List of sized pieces, sorted from left to right.
+                   The level-t values are sums of the values of the original pieces when the pieces are contiguous
+                   (each piece starts where the previous one ends); otherwise the merged pieces are evaluated directly.
     :return: A cake-allocation.
 
     The doctest will work when the set of edges will return according lexicographic order
@@ -155,6 +155,12 @@ def discrete_setting(agents: List[Agent], pieces: List[Tuple[float, float]]) ->
     > Bob gets [(1, 2)] with value 90.0
     <BLANKLINE>
 
+    When the pieces have gaps, a merged piece also contains the gaps between them
+    >>> Carl = PiecewiseConstantAgent([1, 100, 1], "Carl")
+    >>> discrete_setting([Carl], [(0, 1), (2, 3)])
+    > Carl gets [(0, 3)] with value 102.0
+    <BLANKLINE>
+
     """
     # Set m to be the number of pieces in the given partition
     m = len(pieces)
@@ -164,6 +170,12 @@ def discrete_setting(agents: List[Agent], pieces: List[Tuple[float, float]]) ->
     max_weight = 0
     max_match = None
 
+    logger.info("For each piece and agent: compute the agent's value of the piece.")
+    # Evaluate every piece of the original partition once. When the pieces are contiguous, the pieces of the
+    # coarser partitions are unions of consecutive pieces, so their values are sums of these values.
+    evaluations = evaluate_matrix(agents, pieces)
+    contiguous = all(pieces[k][1] == pieces[k + 1][0] for k in range(m - 1))
+
     logger.info("For every t = 0,...,r create the 2 ^ t-partition, partition sequence of 2 ^ t items.")
     logger.info("Denote the t-th partition by Pt.")
     # Go over the partition by powers of 2
@@ -172,26 +184,20 @@ def discrete_setting(agents: List[Agent], pieces: List[Tuple[float, float]]) ->
         # Change the partition to be a partition with 2^t size of every piece
         partition_i = change_partition(pieces, t)
 
-        logger.info("For each piece and agent: compute the agent's value of the piece.")
-        # Evaluate every piece in the new partition
-        evaluations = {}
-        # Go over every piece in the partition
-        for piece in partition_i:
-            # Go over each Agent
-            for agent in agents:
-                # Evaluate the piece according to the Agent
-                evaluations[(agent, piece)] = agent.eval(start=piece[0], end=piece[1])
-
-        logger.info("create the partition graph G - Pt=%d", t)
-        # Create the matching graph according to the new partition
-        g_i = create_matching_graph(agents, partition_i, evaluations)
+        logger.info("create the weight matrix of the partition graph G - Pt=%d", t)
+        # The weight matrix of the partition graph, rows are agents and columns are pieces
+        if contiguous:
+            # sum each 2^t consecutive columns of the evaluations, leftover pieces are dropped as in change_partition
+            weights_i = evaluations[:, :len(partition_i) * 2 ** t].reshape(len(agents), len(partition_i), 2 ** t).sum(axis=2)
+        else:
+            # the merged pieces contain the gaps between the original pieces, so they are evaluated directly
+            weights_i = evaluate_matrix(agents, partition_i)
         logger.info("Compute a maximum weight matching Mt in the graph GPt")
-        # Find the max weight matching of the graph and get the set of edges of the matching
-        edges_set = max_weight_matching(g_i)
-        # Set the edges to be in order, (Agent, partition)
-        edges_set = fix_edges(edges_set)
+        # Find the max weight matching of the graph and get the set of edges (Agent, partition) of the matching
+        rows, cols = max_weight_assignment(weights_i)
+        edges_set = {(agents[i], partition_i[j]) for i, j in zip(rows, cols)}
         # Calculate the sum of the weights in the edges set
-        weight = calculate_weight(g_i, edges_set)
+        weight = calculate_weight(weights_i, rows, cols)
         # Check for the max weight
         if weight > max_weight:
             max_weight = weight
@@ -204,8 +210,9 @@ def discrete_setting(agents: List[Agent], pieces: List[Tuple[float, float]]) ->
     # Create the allocation
     allocation = Allocation(chosen_agents)
     # Add the edges to the allocation
+    agent_index = {agent: i for i, agent in enumerate(chosen_agents)}
     for edge in max_match:
-        allocation.set_piece(agent_index=chosen_agents.index(edge[0]), piece=[edge[1]])
+        allocation.set_piece(agent_index=agent_index[edge[0]], piece=[edge[1]])
 
     return allocation
 
@@ -226,57 +233,157 @@ def continuous_setting(agents: List[Agent]) -> Allocation:
     >>> Alice1 = PiecewiseConstantAgent([100, 1], "Alice")
     >>> Alice2 = PiecewiseConstantAgent([100, 1], "Alice")
     >>> continuous_setting([Alice1, Alice2])
-    > Alice gets [(0, 2.0)] with value 101.0
+    > Alice gets [(0.0, 2.0)] with value 101.0
     <BLANKLINE>
     """
     # set n to be the number of agents
     n = len(agents)
     logger.info("Choose n/2 agents at random. Denote this set by S.")
-    # Choose randomly half of the agents
-    s = random.choices(agents, k=n//2)
-    # Create a new partition
-    partitions = set()
-    # Add the start to the partition
-    partitions.add(0)
+    # Choose randomly half of the agents, without repetitions
+    s = random.sample(agents, k=n//2)
+    # The boundary points of the new partition, starting with the start of the cake
+    marks = [0.0]
 
     logger.info("For every agent i in S, ask i to divide [0, 1] into 2n intervals of equal worth")
     # Go over all the agents that were chosen
     for a in s:
         start = 0
+        # The value of each of the 2n intervals
+        piece_value = a.cake_value()/(2*n)
         # Get pieces with value of 2n
         for i in range(0,2*n):
-            end = a.mark(start, a.cake_value()/(2*n))
+            end = a.mark(start, piece_value)
             # if the piece is out of boundaries we don't add it to the partition
             if end is None:
                 break
-            end = float("%.4f" % end)
+            end = round(end, 4)
             # Add the piece to the partition
-            partitions.add(end)
+            marks.append(end)
             start = end
 
-    partitions = list(partitions)
-    # Sort the pieces
-    partitions = sorted(partitions)
-
     logger.info("Generate a partition J by taking the union of all boundary points reported by the agents of S.")
-    # Turn the list of the pieces into one partition
-    start = partitions[0]
-    pieces = []
-    # Go over all the parts of the partitions and turn it to one partition
-    for part in partitions[1:]:
-        p = (start, part)
-        pieces.append(p)
-        start = part
+    # Remove duplicate boundary points and sort them
+    partitions = np.unique(marks).tolist()
+    # Turn the list of the boundary points into one partition
+    pieces = list(zip(partitions[:-1], partitions[1:]))
 
     logger.info("Invoke Algorithm 2 on the rest of the agents and on the sequence of items in J")
     # Get the agents that were nor chosen
-    agents = list(set(agents) - set(s))
+    chosen = set(s)
+    agents = [agent for agent in agents if agent not in chosen]
     # Find the best allocation for those agents with the partition we generated and use Algo 2 to do that
     res = discrete_setting(agents, pieces)
     # Return the allocation
     return res
 
 
+def evaluate_matrix(agents: List[Agent], pieces: List[Tuple[float, float]]) -> np.ndarray:
+    """
+    Used in algorithm 1 and 2.
+    Evaluate every piece for every agent.
+    The values of all piecewise-constant agents are computed together, and the values of each
+    piecewise-uniform agent for all pieces at once; other agents are asked an eval query per piece.
+    :param agents: A list of Agent objects.
+    :param pieces: A list of cake pieces.
+    :return: A matrix where the entry [i, j] is the value of agents[i] to pieces[j].
+
+    >>> Alice = PiecewiseConstantAgent([100, 1], "Alice")
+    >>> Bob = PiecewiseConstantAgent([2, 90], "Bob")
+    >>> evaluate_matrix([Alice, Bob], [(0, 1), (1, 2)]).tolist()
+    [[100.0, 1.0], [2.0, 90.0]]
+    >>> evaluate_matrix([Alice, Bob], [(0.5, 1.5), (1.5, 3)]).tolist()
+    [[50.5, 0.5], [46.0, 45.0]]
+    >>> George = PiecewiseUniformAgent([(0, 1)], "George")
+    >>> evaluate_matrix([George], [(0.5, 1.5), (1.5, 3)]).tolist()
+    [[0.5, 0.0]]
+    >>> Dana = PiecewiseUniformAgent([(0, 1), (2, 4), (6, 9)], "Dana")
+    >>> evaluate_matrix([Alice, Dana], [(0.5, 4.5), (3, 11), (3, 1)]).tolist()
+    [[51.0, 0.0, 0.0], [2.5, 4.0, 0.0]]
+    >>> Alice.values[1] = 5
+    >>> evaluate_matrix([Alice, Dana], [(0.5, 4.5)]).tolist()
+    [[55.0], [2.5]]
+    """
+    starts = np.array([piece[0] for piece in pieces], dtype=float)
+    ends = np.array([piece[1] for piece in pieces], dtype=float)
+    values = np.empty((len(agents), len(pieces)))
+    constant_rows = [i for i, agent in enumerate(agents) if isinstance(agent, PiecewiseConstantAgent)]
+    if constant_rows:
+        values[constant_rows] = _evaluate_piecewise_constant([agents[i] for i in constant_rows], starts, ends)
+    for i, agent in enumerate(agents):
+        if isinstance(agent, PiecewiseConstantAgent):
+            pass  # already evaluated above
+        elif isinstance(agent, PiecewiseUniformAgent):
+            # The value of a piece is the total length of its intersections with the desired regions
+            regions = np.array(agent.desired_regions, dtype=float).reshape(-1, 2)
+            row = (np.clip(ends[:, None], regions[:, 0], regions[:, 1])
+                   - np.clip(starts[:, None], regions[:, 0], regions[:, 1])).sum(axis=1)
+            values[i] = np.where(ends > starts, row, 0.0)
+        else:
+            values[i] = [agent.eval(start=start, end=end) for (start, end) in pieces]
+    return values
+
+
+def _evaluate_piecewise_constant(agents: List[PiecewiseConstantAgent], starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Evaluate all pieces for a list of piecewise-constant agents at once.
+
+    >>> Alice = PiecewiseConstantAgent([100, 1], "Alice")
+    >>> Carl = PiecewiseConstantAgent([1, 2, 3], "Carl")
+    >>> _evaluate_piecewise_constant([Alice, Carl], np.array([0.5, 1.5, -1]), np.array([1.5, 3, 0.5])).tolist()
+    [[50.5, 0.5, 50.0], [1.5, 4.0, 0.5]]
+    """
+    length = max(agent.cake_length() for agent in agents)
+    # The cake of a shorter agent is padded with worthless cake
+    densities = np.zeros((len(agents), length))
+    for i, agent in enumerate(agents):
+        densities[i, :agent.cake_length()] = agent.values
+    cumulative = np.zeros((len(agents), length + 1))
+    np.cumsum(densities, axis=1, out=cumulative[:, 1:])
+
+    def cumulative_at(points: np.ndarray) -> np.ndarray:
+        # The cumulative value is linear between integer points, and constant outside the cake
+        points = np.clip(points, 0, length)
+        floors = np.minimum(np.floor(points).astype(np.int64), length - 1)
+        return cumulative[:, floors] + (points - floors) * densities[:, floors]
+
+    values = cumulative_at(ends) - cumulative_at(starts)
+    return np.where(ends > starts, values, 0.0)
+
+
+def max_weight_assignment(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Used in algorithm 1 and 2.
+    Find a maximum weight matching in a bipartite graph given by its weight matrix.
+    Since the graph is bipartite, this is a linear assignment problem, solved with the Hungarian algorithm.
+    Edges with non-positive weight add nothing to the matching, so they are dropped.
+    :param weights: A matrix where weights[i, j] is the value of agent i to piece j.
+    :return: Two arrays - the row (agent) indices and the column (piece) indices of the matched edges.
+
+    >>> rows, cols = max_weight_assignment(np.array([[100.0, 1.0], [2.0, 90.0]]))
+    >>> list(zip(rows.tolist(), cols.tolist()))
+    [(0, 0), (1, 1)]
+    >>> rows, cols = max_weight_assignment(np.array([[3.0, 0.0], [9.0, 0.0]]))
+    >>> list(zip(rows.tolist(), cols.tolist()))
+    [(1, 0)]
+    >>> weights = np.array([[5.0, 4.0, 3.0, 2.0, 1.0] * 40, [5.0, 1.0, 1.0, 1.0, 1.0] * 40])
+    >>> rows, cols = max_weight_assignment(weights)
+    >>> calculate_weight(weights, rows, cols)
+    10.0
+    """
+    num_of_agents, num_of_pieces = weights.shape
+    if num_of_pieces >= PRUNING_RATIO * num_of_agents:
+        # Some maximum weight matching uses only the n heaviest pieces of every agent:
+        # if an agent gets another piece, one of its n heaviest pieces is free and is worth at least as much.
+        # So only the pieces that are among the n heaviest of some agent are kept.
+        pieces = np.unique(np.argpartition(-weights, num_of_agents - 1, axis=1)[:, :num_of_agents])
+        rows, cols = linear_sum_assignment(weights[:, pieces], maximize=True)
+        cols = pieces[cols]
+    else:
+        rows, cols = linear_sum_assignment(weights, maximize=True)
+    positive = weights[rows, cols] > 0
+    return rows[positive], cols[positive]
+
+
 def create_partition(size: float, start: float=0) -> List[Tuple[float, float]]:
     """
     Used in algorithm 1.
@@ -286,50 +393,21 @@ def create_partition(size: float, start: float=0) -> List[Tuple[float, float]]:
     :return: A partition as described.
 
     >>> create_partition(0.5, 0)
-    [(0, 0.5), (0.5, 1.0)]
-
-    """
-    #print("create_partition: size- ", size, "start- ", start)
-    res = []
-    end = start + size
-    # Iterate until we divide all the cake into pieces
-    while end <= 1:
-        # add the piece to the list
-        res.append((start, end))
-        start = end
-        end = start + size
-    #print("create_partition: return value- ", res)
-    return res
+    [(0.0, 0.5), (0.5, 1.0)]
+    >>> create_partition(0.3, 0.1)
+    [(0.1, 0.4), (0.4, 0.7), (0.7, 1.0)]
 
+    The pieces are computed from the start, so rounding errors do not accumulate and no piece is lost
+    >>> len(create_partition(0.025))
+    40
+    >>> create_partition(0.1)[-1]
+    (0.9, 1.0)
 
-def fix_edges(edges_set: Set[Tuple[Agent, Tuple[float, float]]]) -> Set[Tuple[Agent, Tuple[float, float]]]:
     """
-    Used in algorithm 1 and 2.
-    Fix the edge format, sometimes the edges are written backwards
-    since the matching algorithm does not care about the edge direction.
-    Each edge contains agent and a piece, this function will make sure the agent comes first in the edge.
-    :param edges_set: A set of edges to fix.
-    :return: A copy of the fixed set of edges.
-
-    >>> Alice = PiecewiseConstantAgent([100, 1], "Alice")
-    >>> Bob = PiecewiseConstantAgent([2, 90], "Bob")
-    >>> partitions = [(0, 1), (1, 2)]
-    >>> edges_set = {(Alice, (0, 1.4889))}
-    >>> fix_edges(edges_set)
-    {(Alice is a piecewise-constant agent with values [100   1] and total value=101, (0, 1.4889))}
-    """
-    ret = set()
-    # Go over all the edges and check if they are in the right order
-    for edge in edges_set:
-        # If the partition is first we swap the sides of the edge
-        if not isinstance(edge[0], Agent):
-            ret.add((edge[1], edge[0]))
-        else:
-            # The Agent is first and we leave it like that
-            ret.add((edge[0], edge[1]))
-    # we return the set of edges when all the edges are in the right order of (Agent, partition)
-
-    return ret
+    # The number of pieces that fit in [start, 1], allowing for rounding errors
+    count = int(np.floor((1 - start) / size + 1e-9))
+    starts = start + size * np.arange(count)
+    return list(zip(starts.tolist(), (starts + size).tolist()))
 
 
 def change_partition(partition: List[tuple], t: int) -> List[tuple]:
@@ -342,71 +420,35 @@ def change_partition(partition: List[tuple], t: int) -> List[tuple]:
 
     >>> change_partition([(0.0, 1.0), (1.0, 2.0)], 1)
     [(0.0, 2.0)]
+    >>> change_partition([(0, 1), (1, 2), (2, 3), (3, 4), (4, 5)], 1)
+    [(0, 2), (2, 4)]
 
     """
-
-    ret = []
-    # Go over all the original partitions with 2^t jumps
-    for start in range(0, len(partition) - 2 ** t + 1, 2 ** t):
-        end = start + 2 ** t - 1
-        # Add the new joined partition to the list
-        ret.append((partition[start][0], partition[end][1]))
-    return ret
+    size = 2 ** t
+    # Leftover pieces that do not fill a whole group of 2^t pieces are dropped
+    count = len(partition) // size
+    bounds = np.array(partition).reshape(-1, 2)
+    # Each new piece starts where its first original piece starts and ends where its last one ends
+    starts = bounds[0:count * size:size, 0]
+    ends = bounds[size - 1:count * size:size, 1]
+    return list(zip(starts.tolist(), ends.tolist()))
 
 
-def calculate_weight(g: Graph, edges_set: Set[Tuple[Agent, Tuple[float, float]]]) -> float:
+def calculate_weight(weights: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> float:
     """
-    Used in algorithm 2.
-    Calculates the weight of a match over a graph.
-    :param g: The graph with all the weights.
-    :param edges_set: The edges of the matching - for which we will sum the weight.
+    Used in algorithm 1 and 2.
+    Calculates the weight of a match over a weight matrix.
+    :param weights: The weight matrix of the graph.
+    :param rows: The row (agent) indices of the edges of the matching.
+    :param cols: The column (piece) indices of the edges of the matching.
     :return: A single number - the total weight.
 
-    >>> Alice = PiecewiseConstantAgent([100, 1], "Alice")
-    >>> Bob = PiecewiseConstantAgent([2, 90], "Bob")
-    >>> partitions = [(0, 1), (1, 2)]
-    >>> g = create_matching_graph([Alice, Bob], partitions, {(Alice, (0, 1)): 100.0, (Bob, (0, 1)): 2.0, (Alice, (1, 2)): 1.0, (Bob, (1, 2)): 90.0})
-    >>> calculate_weight(g, {(Bob,(1,2)), (Alice, (0,1))})
+    >>> weights = np.array([[100.0, 1.0], [2.0, 90.0]])
+    >>> calculate_weight(weights, [1, 0], [1, 0])
     190.0
 
     """
-    ret = 0
-    # Go over all the weights of the edges and sum the weights
-    for edge in edges_set:
-        ret += g.get_edge_data(edge[0], edge[1])['weight']
-    return ret
-
-
-def create_matching_graph(left: List[Agent], right: List[Tuple[float, float]],
-                          weights: Dict[Tuple[Agent, Tuple[float, float]], float])-> nx.Graph:
-    """
-    Used in algorithm 2 and 3.
-    Creating a weighted bi-partition graph that represents agents, cake pieces and values.
-    :param left: List of agents.
-    :param right: List of cake pieces.
-    :param weights: A dictionary from agents to pieces - represents the value of each agent to each piece.
-    :return: A graph object from the given parameters.
-
-    >>> Alice = PiecewiseConstantAgent([100, 1], "Alice")
-    >>> Bob = PiecewiseConstantAgent([2, 90], "Bob")
-    >>> partitions = [(0, 1), (1, 2)]
-    >>> g = create_matching_graph([Alice, Bob], partitions, {(Alice, (0, 1)): 100.0, (Bob, (0, 1)): 2.0, (Alice, (1, 2)): 1.0, (Bob, (1, 2)): 90.0})
-    >>> list(g.edges(data=True))
-    [(Alice is a piecewise-constant agent with values [100   1] and total value=101, (0, 1), {'weight': 100.0}), (Alice is a piecewise-constant agent with values [100   1] and total value=101, (1, 2), {'weight': 1.0}), (Bob is a piecewise-constant agent with values [ 2 90] and total value=92, (0, 1), {'weight': 2.0}), (Bob is a piecewise-constant agent with values [ 2 90] and total value=92, (1, 2), {'weight': 90.0})]
-
-    """
-
-    # Create the graph
-    g = nx.DiGraph()
-    # g.edges(data = True)
-    # Set the left side of the graph to be the Agents
-    g.add_nodes_from(left, bipartite=0)
-    # Set the right side of the graph to be the partitions
-    g.add_nodes_from(right, bipartite=1)
-    # Set the edges of the graph with their weights
-    for key, value in weights.items():
-        g.add_edge(key[0], key[1], weight=value)
-    return g
+    return float(weights[rows, cols].sum())
 
 
 if __name__ == "__main__":
@@ -20,7 +20,7 @@ with open(path.join(here, 'README.md'), encoding='utf-8') as f:
 # with open(path.join(here, 'requirements.txt'), encoding='utf-8') as f:
 #     requirements = f.read().splitlines()
 #     requirements = [r for r in requirements if "git+" not in r]
-requirements = ["numpy","cvxpy","networkx","matplotlib"]
+requirements = ["numpy","scipy","cvxpy","networkx","matplotlib"]
 
 # Arguments marked as "Required" below must be included for upload to PyPI.
 # Fields marked as "Optional" may be commented out.